@@ -11,6 +11,16 @@ from django.contrib.auth import get_user_model
 from django.http import HttpResponse
 from core.schema import Query as CoreQuery, Mutation as CoreMutation
 
+# The tokenAuth mutation is kept as constant fragments, so that each request only
+# has to join the credentials in.
+_TOKEN_AUTH_MUTATION_HEAD = 'mutation { tokenAuth(username: "'
+_TOKEN_AUTH_MUTATION_PASSWORD = '", password: "'
+_TOKEN_AUTH_MUTATION_TAIL = '") { token refreshExpiresIn } }'
+
+# Values are embedded in GraphQL string literals, so quotes, backslashes and
+# line breaks have to be escaped to keep the document valid.
+_GQL_STR_ESCAPE = str.maketrans({'"': '\\"', '\\': '\\\\', '\n': '\\n', '\r': '\\r'})
+
 
 def authenticate_decorator(view_func):
     @wraps(view_func)
@@ -31,6 +41,9 @@ def authenticate_decorator(view_func):
 class InformationMediatorMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        # Building the graphene schema is expensive, so it is done once per
+        # middleware instance rather than on every authenticated request.
+        self._client = None
 
     def __call__(self, request):
         if request.headers.get('Information-Mediator-Client', None):
@@ -56,22 +69,24 @@ class InformationMediatorMiddleware:
             context = SimpleNamespace(user=None)
         return context
 
+    def get_token_auth_mutation(self, username, password):
+        return ''.join((
+            _TOKEN_AUTH_MUTATION_HEAD, str(username).translate(_GQL_STR_ESCAPE),
+            _TOKEN_AUTH_MUTATION_PASSWORD, str(password).translate(_GQL_STR_ESCAPE),
+            _TOKEN_AUTH_MUTATION_TAIL,
+        ))
+
     # TODO: This mutation-based login approach is a temporary solution. In the future,
     # we should integrate with an external authentication service. The usage of
     # this mutation for login purposes should be phased out once that integration
     # is complete and has been tested to work reliably.
     def authenticate_user(self, request):
-        client = self.get_client(Schema, CoreQuery, CoreMutation)
+        if self._client is None:
+            self._client = self.get_client(Schema, CoreQuery, CoreMutation)
+        client = self._client
         username = os.getenv('login_openIMIS')
         password = os.getenv('password_openIMIS')
-        mutation = f'''
-          mutation {{
-              tokenAuth(username: "{username}", password: "{password}") {{
-                  token
-                  refreshExpiresIn
-              }}
-          }}
-          '''
+        mutation = self.get_token_auth_mutation(username, password)
         context = self.get_context(request)
         result = client.execute(mutation, context=context)
         if 'data' in result and 'tokenAuth' in result['data'] and 'token' in result['data']['tokenAuth']: